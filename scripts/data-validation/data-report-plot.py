@@ -6,24 +6,49 @@ Publication-ready figure with strict alignment and consistent aesthetics.
 
 import pandas as pd
 import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")  # File output only; skip interactive backend setup
 import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap, BoundaryNorm
-from datetime import datetime, timedelta
+from matplotlib.colors import (
+    LinearSegmentedColormap,
+    ListedColormap,
+    BoundaryNorm,
+    NoNorm,
+)
+from matplotlib.cm import ScalarMappable
+from datetime import timedelta
 import argparse
 import matplotlib.dates as mdates
 
 
+def read_daily_counts(daily_counts_csv):
+    """Load the daily counts CSV, using the PyArrow parser when it is installed."""
+    try:
+        return pd.read_csv(daily_counts_csv, engine="pyarrow")
+    except ImportError:
+        header = pd.read_csv(daily_counts_csv, nrows=0).columns
+        counts_dtype = {col: np.int32 for col in header if col != "Site"}
+        return pd.read_csv(daily_counts_csv, dtype=counts_dtype)
+
+
+def smallest_count_dtype(data_matrix):
+    """Return the narrowest integer dtype that holds every daily count."""
+    max_count = data_matrix.max(initial=0)
+    if max_count < 256:
+        return np.uint8
+    if max_count < 65536:
+        return np.uint16
+    return np.int32
+
+
 def compute_month_info(dates):
     """Return month ticks, labels, and boundaries for vertical separators."""
-    ticks, labels, boundaries = [0], [dates[0].strftime("%b")], []
-    current_month = dates[0].month
-
-    for i, d in enumerate(dates[1:], 1):
-        if d.month != current_month:
-            ticks.append(i)
-            labels.append(d.strftime("%b"))
-            boundaries.append(i - 0.5)
-            current_month = d.month
+    months = dates.month.to_numpy().astype(np.int8)
+    change = np.flatnonzero(np.diff(months))
+    ticks = np.concatenate(([0], change + 1))
+    labels = [dates[i].strftime("%b") for i in ticks]
+    boundaries = change + 0.5
 
     return ticks, labels, boundaries
 
@@ -42,18 +67,57 @@ def smart_count_bins(data_matrix, max_bins=8):
         cats = np.unique(np.concatenate(([0], reps)))
 
     categories = np.sort(cats)
-    bounds = [categories[0] - 0.5]
-    for i in range(1, len(categories)):
-        bounds.append((categories[i - 1] + categories[i]) / 2)
-    bounds.append(categories[-1] + 0.5)
+    mids = 0.5 * (categories[:-1] + categories[1:])
+    bounds = np.concatenate(([categories[0] - 0.5], mids, [categories[-1] + 0.5]))
+
+    return categories, bounds
+
+
+def column_modes(data_matrix):
+    """Return the most frequent value in each column (smallest value on ties)."""
+    values = data_matrix.astype(np.int64)
+    n_cols = values.shape[1]
+    width = int(values.max()) + 1 if values.size else 1
+    # One flat bincount over (column, value) pairs instead of one per column
+    counts = np.bincount(
+        (values + np.arange(n_cols) * width).ravel(), minlength=n_cols * width
+    )
+    return counts.reshape(n_cols, width).argmax(axis=1)
+
+
+def category_colormap(cmap, n_categories):
+    """Sample one colour per category, spread over cmap as BoundaryNorm would."""
+    if n_categories == 1:
+        lut = np.array([(cmap.N - 1) // 2])
+    else:
+        lut = np.arange(n_categories) * (cmap.N - 1) // (n_categories - 1)
+    return ListedColormap(cmap(lut))
 
-    return categories, np.array(bounds, dtype=float)
+
+def downsample_columns(data_matrix, max_cols):
+    """Block-average columns so the matrix is at most max_cols wide."""
+    n_cols = data_matrix.shape[1]
+    block = -(-n_cols // max_cols)
+    if block <= 1:
+        return data_matrix
+
+    starts = np.arange(0, n_cols, block)
+    widths = np.diff(np.append(starts, n_cols))
+    return np.add.reduceat(data_matrix, starts, axis=1, dtype=np.float64) / widths
 
 
 def add_month_separators(ax, boundaries, color="white", lw=2.5, alpha=0.9):
-    """Add vertical white bars at month boundaries."""
-    for boundary in boundaries:
-        ax.axvline(x=boundary, color=color, linewidth=lw, alpha=alpha, zorder=10)
+    """Add vertical white bars at month boundaries as a single LineCollection."""
+    ax.vlines(
+        boundaries,
+        0,
+        1,
+        transform=ax.get_xaxis_transform(),
+        colors=color,
+        linewidth=lw,
+        alpha=alpha,
+        zorder=10,
+    )
 
 
 def style_axis(ax, spine_visible=False):
@@ -67,22 +131,23 @@ def create_combined_figure(daily_counts_csv, output_file="deployment_combined.pn
     """Create combined publication-ready figure with heatmap and completeness plot."""
 
     # Load and prepare data
-    df = pd.read_csv(daily_counts_csv)
+    df = read_daily_counts(daily_counts_csv)
     date_cols = [col for col in df.columns if col != "Site"]
     sites = df["Site"].values
-    data_matrix = df[date_cols].values
-    dates = [datetime.strptime(d, "%Y-%m-%d") for d in date_cols]
-
-    # Sort sites by missing data
-    row_means = data_matrix.mean(axis=1)
-    overall_max = data_matrix.max() if data_matrix.size > 0 else 1
-    overall_max = max(overall_max, 1)
-    missing_score = 1.0 - (row_means / overall_max)
-    sort_idx = np.argsort(missing_score)[::-1]
+    data_matrix = df[date_cols].to_numpy(dtype=np.int32)
+    data_matrix = data_matrix.astype(smallest_count_dtype(data_matrix), copy=False)
+    dates = pd.to_datetime(date_cols, format="%Y-%m-%d")
+
+    # Sort sites by missing data (fewest recordings per day first)
+    row_means = data_matrix.mean(axis=1, dtype=np.float32)
+    sort_idx = np.argsort(row_means, kind="stable")
     sites, data_matrix = sites[sort_idx], data_matrix[sort_idx]
 
     # Month information
     month_ticks, month_labels, month_boundaries = compute_month_info(dates)
+    date_nums = mdates.date2num(dates.to_numpy())
+
+    dpi = 300
 
     # Create figure with two subplots using sharex=True for strict alignment
     # height_ratios: 2.5 vs 1.25 is exactly 2:1 ratio
@@ -107,34 +172,40 @@ def create_combined_figure(daily_counts_csv, output_file="deployment_combined.pn
         "#1a9850",
         "#006837",
     ]
-    cmap = LinearSegmentedColormap.from_list("counts", colors, N=256)
-    norm = BoundaryNorm(count_bounds, cmap.N)
+    cmap = category_colormap(
+        LinearSegmentedColormap.from_list("counts", colors, N=256), len(categories)
+    )
+
+    # Bin counts into category indices up front so imshow only does a lookup
+    # Never hand imshow more day columns than the figure has pixels
+    binned = np.searchsorted(
+        count_bounds,
+        downsample_columns(data_matrix, int(fig.get_figwidth() * dpi)),
+        side="right",
+    )
+    binned = np.clip(binned - 1, 0, len(categories) - 1).astype(np.uint8)
 
     # Use imshow with datetime extent for alignment, padded for bar width
     extent = [
-        mdates.date2num(dates[0]) - 0.5,
-        mdates.date2num(dates[-1]) + 0.5,
+        date_nums[0] - 0.5,
+        date_nums[-1] + 0.5,
         len(sites) - 0.5,
         -0.5,
     ]
     im = ax1.imshow(
-        data_matrix,
+        binned,
         extent=extent,
         aspect="auto",
         cmap=cmap,
-        norm=norm,
+        norm=NoNorm(),
         interpolation="nearest",
+        interpolation_stage="rgba",
     )
+    # Keep the heatmap as a bitmap in vector outputs; text and axes stay vector
+    im.set_rasterized(True)
 
     # Month separators at date positions
-    for tick in month_ticks[1:]:
-        ax1.axvline(
-            mdates.date2num(dates[tick]),
-            color="white",
-            linewidth=2.5,
-            alpha=0.9,
-            zorder=10,
-        )
+    add_month_separators(ax1, date_nums[month_ticks[1:]])
 
     # Axes styling
     ax1.set_yticks(np.arange(len(sites)))
@@ -154,12 +225,13 @@ def create_combined_figure(daily_counts_csv, output_file="deployment_combined.pn
     # Colorbar: Positioned higher to avoid overlap
     axins = ax1.inset_axes([0.75, 1.05, 0.25, 0.03])
     cbar = plt.colorbar(
-        im, cax=axins, orientation="horizontal", boundaries=count_bounds
+        ScalarMappable(norm=BoundaryNorm(count_bounds, cmap.N), cmap=cmap),
+        cax=axins,
+        orientation="horizontal",
+        boundaries=count_bounds,
     )
 
-    tick_centers = [
-        0.5 * (count_bounds[i] + count_bounds[i + 1]) for i in range(len(categories))
-    ]
+    tick_centers = 0.5 * (count_bounds[:-1] + count_bounds[1:])
     cbar.set_ticks(tick_centers)
     cbar.set_ticklabels([str(int(v)) for v in categories])
     cbar.set_label("Recordings/day", fontsize=20, weight="bold", labelpad=10)
@@ -172,47 +244,47 @@ def create_combined_figure(daily_counts_csv, output_file="deployment_combined.pn
     # ========== Panel B: Completeness ==========
 
     # Calculate missing percentage
-    mode_per_day = np.array(
-        [
-            np.bincount(data_matrix[:, i].astype(int)).argmax()
-            for i in range(data_matrix.shape[1])
-        ]
+    mode_per_day = column_modes(data_matrix)
+    reference_per_day = mode_per_day.astype(np.int64) * len(sites)
+    total_effective = np.minimum(data_matrix, mode_per_day, dtype=np.int32).sum(
+        axis=0, dtype=np.int64
+    )
+    # Days whose modal count is zero have no reference and are left blank
+    pct_non_missing = np.divide(
+        total_effective * 100.0,
+        reference_per_day,
+        out=np.full(reference_per_day.shape, np.nan),
+        where=reference_per_day > 0,
     )
-    reference_per_day = mode_per_day * len(sites)
-    effective_matrix = np.minimum(data_matrix, mode_per_day[None, :])
-    total_effective = effective_matrix.sum(axis=0)
-    pct_missing = ((reference_per_day - total_effective) / reference_per_day) * 100
-    pct_non_missing = 100 - pct_missing
-
-    # Stacked bars
-    ax2.bar(
-        dates,
-        pct_non_missing,
-        width=1,
+
+    # Stacked bars as two stepped fills (one artist each, not one per day);
+    # days without a reference get zero height in both
+    day_edges = np.append(dates - timedelta(days=0.5), dates[-1] + timedelta(days=0.5))
+    complete_top = np.append(np.nan_to_num(pct_non_missing, nan=0.0), 0.0)
+    missing_bottom = np.append(np.nan_to_num(pct_non_missing, nan=100.0), 100.0)
+    complete_fill = ax2.fill_between(
+        day_edges,
+        0,
+        complete_top,
+        step="post",
         color="#1a9850",
-        edgecolor="none",
+        linewidth=0,
         label="Complete",
     )
-    ax2.bar(
-        dates,
-        pct_missing,
-        width=1,
-        bottom=pct_non_missing,
+    missing_fill = ax2.fill_between(
+        day_edges,
+        missing_bottom,
+        100,
+        step="post",
         color="#d73027",
-        edgecolor="none",
+        linewidth=0,
         label="Missing",
     )
+    complete_fill.set_rasterized(True)
+    missing_fill.set_rasterized(True)
 
     # Month separators
-    for tick in month_ticks[1:]:
-        ax2.axvline(
-            dates[tick],
-            color="white",
-            linestyle="-",
-            linewidth=2.5,
-            alpha=0.9,
-            zorder=10,
-        )
+    add_month_separators(ax2, date_nums[month_ticks[1:]])
 
     # Axes
     # Set xlim to match padded extent
@@ -243,7 +315,7 @@ def create_combined_figure(daily_counts_csv, output_file="deployment_combined.pn
     # Increase top margin for colorbar
     plt.subplots_adjust(top=0.95)
 
-    plt.savefig(output_file, dpi=300, bbox_inches="tight", facecolor="white")
+    plt.savefig(output_file, dpi=dpi, bbox_inches="tight", facecolor="white")
     print(f"✓ Saved combined figure: {output_file}")
     print(f"  Panel A: Daily recording counts ({len(sites)} sites × {len(dates)} days)")
     print(f"  Panel B: Daily recording completeness")
@@ -9,6 +9,8 @@ import os
 from pathlib import Path
 from datetime import datetime, timedelta, date
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
@@ -17,18 +19,32 @@ import warnings
 
 warnings.filterwarnings("ignore")
 
+NS_PER_MINUTE = 60 * 1_000_000_000
+NS_PER_HOUR = 60 * NS_PER_MINUTE
+NS_PER_DAY = 24 * NS_PER_HOUR
 
-def parse_audiomoth_filename(filename: str) -> Optional[datetime]:
-    """Parse AudioMoth filename format: YYYYMMDD_HHMMSS.WAV"""
-    try:
-        base = filename.replace(".WAV", "").replace(".wav", "")
-        dt = datetime.strptime(base, "%Y%m%d_%H%M%S")
-        # Filter out invalid timestamps (Unix epoch errors)
-        if dt.year < 2024:
-            return None
-        return dt
-    except:
-        return None
+
+def list_wav_stems(site_path: Path) -> np.ndarray:
+    """
+    Stream the WAV filename stems in a folder into a fixed-width string array
+    Longer stems are cut to 16 chars (one past a timestamp) so they never parse
+    """
+    with os.scandir(site_path) as entries:
+        return np.fromiter(
+            (e.name[:-4] for e in entries if e.name.lower().endswith(".wav")),
+            dtype="U16",
+        )
+
+
+def parse_audiomoth_stems(stems: np.ndarray) -> pd.DatetimeIndex:
+    """
+    Parse AudioMoth filename stems (YYYYMMDD_HHMMSS) in a single vectorized pass
+    Unparseable names and invalid timestamps are dropped
+    """
+    timestamps = pd.to_datetime(stems, format="%Y%m%d_%H%M%S", errors="coerce")
+    timestamps = timestamps.dropna()
+    # Filter out invalid timestamps (Unix epoch errors)
+    return timestamps[timestamps.year >= 2024]
 
 
 def merge_continuous_deployments(site_dirs: List[Path]) -> Dict[str, List[Path]]:
@@ -39,9 +55,8 @@ def merge_continuous_deployments(site_dirs: List[Path]) -> Dict[str, List[Path]]
     merged_sites = defaultdict(list)
 
     for site_dir in site_dirs:
-        site_name = site_dir.name
         # Remove '-2', '-3', etc. suffixes to get base site name
-        base_name = site_name.split("-")[0] if "-" in site_name else site_name
+        base_name = site_dir.name.partition("-")[0]
         merged_sites[base_name].append(site_dir)
 
     return merged_sites
@@ -53,28 +68,16 @@ def analyze_merged_site(
     """
     Analyze data completeness for a site (potentially multiple deployment folders)
     """
-    base_site_name = (
-        site_paths[0].name.split("-")[0]
-        if "-" in site_paths[0].name
-        else site_paths[0].name
-    )
-    all_timestamps = []
-    total_files = 0
-    invalid_files = 0
-
-    # Collect all timestamps from all deployment folders for this site
-    for site_path in sorted(site_paths):
-        wav_files = list(site_path.glob("*.WAV")) + list(site_path.glob("*.wav"))
-        total_files += len(wav_files)
-
-        for f in wav_files:
-            ts = parse_audiomoth_filename(f.name)
-            if ts:
-                all_timestamps.append(ts)
-            else:
-                invalid_files += 1
-
-    if not all_timestamps:
+    base_site_name = site_paths[0].name.partition("-")[0]
+    # Collect filename stems from all deployment folders for this site
+    stems = np.concatenate([list_wav_stems(p) for p in sorted(site_paths)])
+
+    total_files = stems.size
+    # Keep timestamps as sorted int64 nanoseconds since the epoch
+    timestamps_ns = np.sort(parse_audiomoth_stems(stems).as_unit("ns").asi8)
+    invalid_files = total_files - timestamps_ns.size
+
+    if timestamps_ns.size == 0:
         return {
             "site": base_site_name,
             "deployment_folders": [p.name for p in site_paths],
@@ -85,31 +88,31 @@ def analyze_merged_site(
             "last_recording": None,
             "duration_days": 0,
             "actual_recordings": 0,
-            "timestamps": [],
+            "timestamps_ns": timestamps_ns,
             "gaps": [],
-            "daily_counts": {},
+            "first_day": None,
+            "daily_counts": np.zeros(0, dtype=np.int64),
         }
 
-    all_timestamps.sort()
-    first_rec = all_timestamps[0]
-    last_rec = all_timestamps[-1]
-    duration_days = (last_rec - first_rec).total_seconds() / 86400
+    # Calculate daily counts: daily_counts[i] is the count on day first_day + i,
+    # where first_day counts days since the epoch
+    day_idx = timestamps_ns // NS_PER_DAY
+    first_day = int(day_idx[0])
+    daily_counts = np.bincount(day_idx - first_day)
 
-    # Calculate daily counts
-    daily_counts = defaultdict(int)
-    for ts in all_timestamps:
-        daily_counts[ts.date()] += 1
+    first_rec, last_rec = pd.to_datetime(timestamps_ns[[0, -1]]).to_pydatetime()
+    duration_days = (timestamps_ns[-1] - timestamps_ns[0]) / NS_PER_DAY
 
     # Find gaps (>10 minutes to account for sleep cycles)
-    gaps = find_gaps(all_timestamps, max_gap_minutes=10)
+    gaps = find_gaps(timestamps_ns, max_gap_minutes=10)
 
     # Calculate completeness: compare to median daily count for this site
-    median_daily = np.median(list(daily_counts.values())) if daily_counts else 0
+    median_daily = np.median(daily_counts[daily_counts > 0])
     expected_total = (
-        int(median_daily * duration_days) if median_daily > 0 else len(all_timestamps)
+        int(median_daily * duration_days) if median_daily > 0 else timestamps_ns.size
     )
     completeness_pct = (
-        (len(all_timestamps) / expected_total * 100) if expected_total > 0 else 100
+        (timestamps_ns.size / expected_total * 100) if expected_total > 0 else 100
     )
 
     return {
@@ -121,34 +124,36 @@ def analyze_merged_site(
         "first_recording": first_rec,
         "last_recording": last_rec,
         "duration_days": duration_days,
-        "actual_recordings": len(all_timestamps),
+        "actual_recordings": timestamps_ns.size,
         "expected_recordings": expected_total,
         "completeness_pct": completeness_pct,
         "median_daily_recordings": median_daily,
-        "timestamps": all_timestamps,
+        "timestamps_ns": timestamps_ns,
         "gaps": gaps,
+        "first_day": first_day,
         "daily_counts": daily_counts,
     }
 
 
 def find_gaps(
-    timestamps: List[datetime], max_gap_minutes: int = 10
+    timestamps_ns: np.ndarray, max_gap_minutes: int = 10
 ) -> List[Tuple[datetime, datetime, float]]:
     """
     Find gaps larger than max_gap_minutes between consecutive recordings
+    Takes sorted int64 nanosecond timestamps
     Returns list of (start_time, end_time, gap_duration_hours)
     """
-    gaps = []
-
-    for i in range(len(timestamps) - 1):
-        gap_seconds = (timestamps[i + 1] - timestamps[i]).total_seconds()
-        gap_minutes = gap_seconds / 60
-
-        if gap_minutes > max_gap_minutes:
-            gap_hours = gap_seconds / 3600
-            gaps.append((timestamps[i], timestamps[i + 1], gap_hours))
-
-    return gaps
+    diffs = np.diff(timestamps_ns)
+    idx = np.flatnonzero(diffs > max_gap_minutes * NS_PER_MINUTE)
+
+    # Only the gap endpoints are turned back into datetimes
+    return list(
+        zip(
+            pd.to_datetime(timestamps_ns[idx]).to_pydatetime(),
+            pd.to_datetime(timestamps_ns[idx + 1]).to_pydatetime(),
+            (diffs[idx] / NS_PER_HOUR).tolist(),
+        )
+    )
 
 
 def create_daily_heatmap_data(site_results: List[Dict]) -> pd.DataFrame:
@@ -156,25 +161,22 @@ def create_daily_heatmap_data(site_results: List[Dict]) -> pd.DataFrame:
     Create a matrix of daily recording counts for heatmap visualization
     Rows = sites, Columns = dates
     """
-    # Get all unique dates across all sites
-    all_dates = set()
-    for result in site_results:
-        all_dates.update(result["daily_counts"].keys())
-
-    if not all_dates:
+    recorded = [r for r in site_results if r["daily_counts"].size > 0]
+    if not recorded:
         return pd.DataFrame()
 
-    all_dates = sorted(all_dates)
-
-    # Create matrix
-    heatmap_data = []
-    for result in site_results:
-        row = {"Site": result["site"]}
-        for d in all_dates:
-            row[d.strftime("%Y-%m-%d")] = result["daily_counts"].get(d, 0)
-        heatmap_data.append(row)
-
-    df = pd.DataFrame(heatmap_data)
+    # Place each site's counts into one continuous date range
+    day0 = min(r["first_day"] for r in recorded)
+    n_days = max(r["first_day"] + r["daily_counts"].size for r in recorded) - day0
+    matrix = np.zeros((len(site_results), n_days), dtype=np.int32)
+    for i, r in enumerate(site_results):
+        if r["daily_counts"].size > 0:
+            offset = r["first_day"] - day0
+            matrix[i, offset : offset + r["daily_counts"].size] = r["daily_counts"]
+
+    dates = pd.date_range(pd.Timestamp(day0 * NS_PER_DAY), periods=n_days, freq="D")
+    df = pd.DataFrame(matrix, columns=dates.strftime("%Y-%m-%d"))
+    df.insert(0, "Site", [r["site"] for r in site_results])
     return df
 
 
@@ -212,27 +214,33 @@ def analyze_all_sites(
 
     # Analyze each merged site
     site_results = []
-    all_timestamps = []
     total_invalid = 0
 
-    for base_site_name, site_paths in sorted(merged_sites.items()):
-        result = analyze_merged_site(site_paths, recording_interval_sec)
-        site_results.append(result)
-        all_timestamps.extend(result["timestamps"])
-        total_invalid += result["invalid_files"]
-
-        folder_str = ", ".join(result["deployment_folders"])
-        completeness_str = (
-            f"{result['completeness_pct']:.1f}%"
-            if result["completeness_pct"] > 0
-            else "N/A"
-        )
-        print(
-            f"✓ {result['site']:6s} | {folder_str:20s} | "
-            f"{result['n_files']:6d} files | {completeness_str:6s} complete | "
-            f"{len(result['gaps']):4d} gaps"
+    # Sites are I/O-bound on directory listing, so overlap them in threads;
+    # map() keeps results in sorted site order
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(merged_sites)))) as ex:
+        results = ex.map(
+            analyze_merged_site,
+            [site_paths for _, site_paths in sorted(merged_sites.items())],
+            repeat(recording_interval_sec),
         )
 
+        for result in results:
+            site_results.append(result)
+            total_invalid += result["invalid_files"]
+
+            folder_str = ", ".join(result["deployment_folders"])
+            completeness_str = (
+                f"{result['completeness_pct']:.1f}%"
+                if result["completeness_pct"] > 0
+                else "N/A"
+            )
+            print(
+                f"✓ {result['site']:6s} | {folder_str:20s} | "
+                f"{result['n_files']:6d} files | {completeness_str:6s} complete | "
+                f"{len(result['gaps']):4d} gaps"
+            )
+
     # Create site summary DataFrame
     summary_df = pd.DataFrame(
         [
@@ -274,12 +282,12 @@ def analyze_all_sites(
     heatmap_df = create_daily_heatmap_data(site_results)
 
     # Global statistics
-    if all_timestamps:
-        all_timestamps.sort()
-        global_first = all_timestamps[0]
-        global_last = all_timestamps[-1]
+    recorded_results = [r for r in site_results if r["actual_recordings"] > 0]
+    if recorded_results:
+        global_first = min(r["first_recording"] for r in recorded_results)
+        global_last = max(r["last_recording"] for r in recorded_results)
         global_duration = (global_last - global_first).total_seconds() / 86400
-        total_recordings = len(all_timestamps)
+        total_recordings = sum(r["actual_recordings"] for r in recorded_results)
 
         # Calculate global completeness
         global_median_daily = np.median(
@@ -324,7 +332,7 @@ def analyze_all_sites(
         print(f"✓ Saved: {output_prefix}_daily_counts.csv (use for heatmap)")
 
     # Save global stats
-    if all_timestamps:
+    if recorded_results:
         global_stats = {
             "Unique_Sites": len(merged_sites),
             "Deployment_Folders": len(site_dirs),